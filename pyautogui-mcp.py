@@ -8,22 +8,133 @@ through a standardized interface.
 Available tools:
 - Mouse control: click, move, drag, scroll
 - Keyboard input: type, press, hotkey
+- Batching: run a sequence of mouse/keyboard actions in one call
 - Screen capture: screenshot, locate images
 - Window management: get active window, list windows
 - Position tracking: get mouse position, pixel colors
 - User prompts: alert, confirm, prompt, password
+- Background jobs: countdown, display mouse position, wait for job, cancel job
 """
 
 import pyautogui
-from mcp.server.fastmcp import FastMCP
-from typing import Any, Optional, List, Dict
+from mcp.server.fastmcp import FastMCP, Image as MCPImage
+from mcp.types import TextContent
+from typing import Any, Optional, List, Dict, Tuple, Union
 import os
 import io
+import json
 import base64
-import ast
+import asyncio
+import atexit
+import concurrent.futures
+import functools
+import itertools
+import re
+import sys
+import threading
+import time
+from PIL import Image
+
+try:
+    import mss
+    import mss.exception
+except ImportError:
+    mss = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyspng
+except ImportError:
+    pyspng = None
+
+try:
+    import pyperclip
+except ImportError:
+    pyperclip = None
+
+# OpenCV and Numba take a noticeable time to import, so they are loaded on
+# the first image search instead (see _opencv() and _match_kernel()).
+numba = None
+
+# Tools are queued here by @lazy_tool() and only registered with the server,
+# which inspects their signatures and builds their JSON schemas, when a client
+# first lists or calls tools.
+_PENDING_TOOLS: List[Tuple[Any, bool]] = []
+
+
+def lazy_tool(paced: bool = False):
+    """Like server.tool(), but defers registration until tools are first needed.
+
+    Args:
+        paced: Register the tool wrapped with paced(); for tools that drive
+            the mouse or keyboard
+    """
+    def decorator(func):
+        _PENDING_TOOLS.append((func, paced))
+        return func
+    return decorator
+
+
+def paced(func):
+    """Sleep MIN_PAUSE before func if the previous paced call ended under MIN_CALL_GAP ago.
+
+    Applied at registration to the tools that drive the mouse or keyboard
+    (@lazy_tool(paced=True)), so back-to-back input gets a safety pause while
+    input with natural latency between it (and the steps inside
+    batch_actions) runs without one. Read-only tools are never paced, so
+    pixel polling and screenshots aren't slowed down.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        global _last_call_ts
+        if time.monotonic() - _last_call_ts < MIN_CALL_GAP:
+            time.sleep(MIN_PAUSE)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _last_call_ts = time.monotonic()
+    return wrapper
+
+
+def tool_safe(func):
+    """Report PyAutoGUI and screen capture errors as {"error": message} instead of raising."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except _TOOL_ERRORS as e:
+            return {"error": str(e)}
+    return wrapper
+
+
+class LazyToolServer(FastMCP):
+    """FastMCP server that registers @lazy_tool() tools on the first tool request."""
+
+    def _register_pending_tools(self) -> None:
+        for func, is_paced in _PENDING_TOOLS:
+            self.tool()(paced(func) if is_paced else func)
+        _PENDING_TOOLS.clear()
+
+    async def list_tools(self):
+        self._register_pending_tools()
+        return await super().list_tools()
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]):
+        self._register_pending_tools()
+        return await super().call_tool(name, arguments)
+
 
 # Initialize the FastMCP server
-server = FastMCP(
+server = LazyToolServer(
     name="PyAutoGUI",
     instructions="""This server provides PyAutoGUI automation capabilities.
 PyAutoGUI lets your Python scripts control the mouse and keyboard to automate
@@ -44,13 +155,305 @@ Move mouse to a corner of the screen or press Ctrl+C to abort if needed.""",
 
 # Configure PyAutoGUI
 pyautogui.FAILSAFE = True  # Move mouse to top-left corner to abort
-pyautogui.PAUSE = 0.1  # Small pause between actions (0.1 seconds)
+pyautogui.PAUSE = 0.0  # No pause after every action; input tool calls are paced instead (see paced())
+MIN_PAUSE = 0.1  # Pause before an input tool call that closely follows the previous one (seconds)
+MIN_CALL_GAP = 0.02  # Calls closer together than this get MIN_PAUSE (seconds)
+_last_call_ts = 0.0  # time.monotonic() at which the last paced tool call ended
+
+# Typing: text longer than this (printable ASCII, no interval) is pasted
+# through the clipboard instead of typed key by key.
+PASTE_THRESHOLD = 64
+PASTE_SETTLE = 0.1  # Time for the target app to read the clipboard before it is restored (seconds)
+
+# Screenshot encoding
+SCREENSHOT_ENCODINGS = ("png", "jpeg", "ppm", "raw")
+# MCP image format (MIME subtype) for each encoding returned as image content
+_IMAGE_FORMATS = {"png": "png", "jpeg": "jpeg", "ppm": "x-portable-pixmap"}
+PNG_COMPRESS_LEVEL = 1  # zlib level 1: barely larger files, far less CPU than the default 6
+
+# Screen grabber. MSS keeps its OS capture handles (X11 connection, device
+# contexts) open across calls, which is much faster than PyAutoGUI's
+# per-call ImageGrab. It is created on first use and shared by every capture
+# tool. Without MSS we fall back to pyautogui.screenshot().
+_capture = None
+_capture_lock = threading.Lock()
+
+# Per-thread encode buffer for screenshots, see _get_bio()
+_BIO_LOCAL = threading.local()
+
+# Long-running tools run here so they don't block the server. Each job's
+# future and stop event are kept by id until collected with wait_for_job;
+# at most MAX_FINISHED_JOBS finished but uncollected jobs are remembered.
+_EXEC = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+_JOBS: Dict[int, Tuple[concurrent.futures.Future, threading.Event]] = {}
+_JOB_IDS = itertools.count(1)
+MAX_FINISHED_JOBS = 32
+
+# Errors tools report as {"error": ...}: PyAutoGUI's own plus screen capture failures.
+_TOOL_ERRORS = (pyautogui.PyAutoGUIException,) + ((mss.exception.ScreenShotError,) if mss is not None else ())
+
+
+def _get_bio() -> io.BytesIO:
+    """Return this thread's reusable BytesIO for encoding screenshots, rewound.
+
+    The buffer is deliberately not truncated: BytesIO.truncate() releases
+    its memory, while overwriting from the start keeps the capacity grown by
+    earlier screenshots. Read the result back with _bio_value().
+    """
+    bio = getattr(_BIO_LOCAL, "bio", None)
+    if bio is None:
+        bio = _BIO_LOCAL.bio = io.BytesIO()
+    bio.seek(0)
+    return bio
+
+
+def _bio_value(bio: io.BytesIO) -> bytes:
+    """Copy out the bytes written to a _get_bio() buffer since it was handed out.
+
+    Unlike getvalue(), this never shares the internal buffer, so the next
+    screenshot can write into it without forcing a copy.
+    """
+    with bio.getbuffer() as view:
+        return bytes(view[:bio.tell()])
+
+
+def _json_content(payload: Dict[str, Any]) -> TextContent:
+    """Serialize a large tool result to JSON text content.
+
+    orjson is several times faster than the default serializer on
+    multi-megabyte strings such as base64 screenshots; stdlib json is used
+    when it isn't installed.
+    """
+    if orjson is not None:
+        text = orjson.dumps(payload).decode("utf-8")
+    else:
+        text = json.dumps(payload)
+    return TextContent(type="text", text=text)
+
+
+def _get_capture():
+    """Return the shared MSS instance, creating it on first use (None without MSS)."""
+    global _capture
+    if _capture is None and mss is not None:
+        with _capture_lock:
+            if _capture is None:
+                _capture = mss.mss()
+                atexit.register(_capture.close)
+    return _capture
+
+
+def _monitor(region: Optional[List[int]] = None) -> Dict[str, int]:
+    """Convert a [left, top, width, height] region to an MSS monitor dict.
+
+    Without a region the whole screen as PyAutoGUI sees it is used, so
+    coordinates stay consistent with the mouse tools.
+    """
+    if region:
+        left, top, width, height = region
+    else:
+        left, top = 0, 0
+        width, height = pyautogui.size()
+    return {"left": left, "top": top, "width": width, "height": height}
+
+
+def _grab(region: Optional[List[int]] = None) -> Image.Image:
+    """Capture the screen (or a region of it) as an RGB PIL image."""
+    capture = _get_capture()
+    if capture is None:
+        return pyautogui.screenshot(region=region)
+    sct_img = capture.grab(_monitor(region))
+    return Image.frombytes("RGB", sct_img.size, sct_img.rgb)
+
+
+def _grab_pixel(x: int, y: int) -> Tuple[int, int, int]:
+    """Return the (r, g, b) color of one pixel by capturing only that pixel."""
+    capture = _get_capture()
+    if capture is None:
+        return pyautogui.pixel(x, y)
+    if not pyautogui.onScreen(x, y):
+        raise pyautogui.PyAutoGUIException(f"Coordinates ({x}, {y}) are outside the screen")
+    # MSS buffers are BGRA, 4 bytes per pixel.
+    b, g, r = capture.grab({"left": x, "top": y, "width": 1, "height": 1}).raw[:3]
+    return r, g, b
+
+
+# Two-digit lowercase hex for every byte value, for formatting pixel colors
+_HEX = [f"{i:02x}" for i in range(256)]
+
+_COLOR_RE = re.compile(r'^\s*(?:#([0-9a-fA-F]{6})|\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\))\s*$')
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_color(color: str) -> Tuple[int, int, int]:
+    """Parse '#RRGGBB' or '(R, G, B)' into an (r, g, b) tuple."""
+    match = _COLOR_RE.match(color)
+    if match is None:
+        raise ValueError("Invalid color format. Use '#RRGGBB' or '(R, G, B)'.")
+    hex_color, r, g, b = match.groups()
+    if hex_color is not None:
+        return int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
+    return int(r), int(g), int(b)
+
+
+@functools.lru_cache(maxsize=None)
+def _opencv():
+    """Import OpenCV on first use; None if it isn't installed."""
+    try:
+        import cv2
+    except ImportError:
+        return None
+    return cv2
+
+
+@functools.lru_cache(maxsize=32)
+def _load_template(path: str, mtime_ns: int, size: int) -> "np.ndarray":
+    """Decode a template image into a BGR array.
+
+    Cached on (path, mtime, size), so an unchanged file is read and decoded
+    only once; editing the file changes the key and forces a reload.
+    """
+    cv2 = _opencv()
+    if cv2 is None:
+        with Image.open(path) as img:
+            return np.ascontiguousarray(np.asarray(img.convert("RGB"))[:, :, ::-1])
+    needle = cv2.imread(path, cv2.IMREAD_COLOR)
+    if needle is None:
+        raise ValueError(f"Could not read image file: {path}")
+    return needle
+
+
+def _grab_array(region: Optional[List[int]] = None) -> "np.ndarray":
+    """Capture the screen (or a region of it) as a contiguous BGR numpy array."""
+    capture = _get_capture()
+    if capture is None:
+        return np.ascontiguousarray(np.asarray(pyautogui.screenshot(region=region))[:, :, ::-1])
+    return np.ascontiguousarray(np.asarray(capture.grab(_monitor(region)))[:, :, :3])
+
+
+def _ccoeff_normed(haystack, needle):
+    """Normalized correlation coefficient of needle at every offset in haystack.
+
+    Computes the same score as cv2.TM_CCOEFF_NORMED over all channels, so
+    'confidence' means the same with either backend; windows or templates
+    without any variation score 0. Plain Python source; only ever called
+    compiled, via _match_kernel().
+    """
+    height, width, channels = needle.shape
+    count = height * width
+    template = np.empty((height, width, channels), dtype=np.float64)
+    template_sq = 0.0
+    for c in range(channels):
+        mean = 0.0
+        for dy in range(height):
+            for dx in range(width):
+                mean += needle[dy, dx, c]
+        mean /= count
+        for dy in range(height):
+            for dx in range(width):
+                value = needle[dy, dx, c] - mean
+                template[dy, dx, c] = value
+                template_sq += value * value
+
+    rows = haystack.shape[0] - height + 1
+    cols = haystack.shape[1] - width + 1
+    scores = np.zeros((rows, cols), dtype=np.float64)
+    if template_sq == 0.0:
+        return scores
+    for y in numba.prange(rows):
+        for x in range(cols):
+            cross = 0.0
+            window_sq = 0.0
+            for c in range(channels):
+                total = 0.0
+                total_sq = 0.0
+                for dy in range(height):
+                    for dx in range(width):
+                        value = np.float64(haystack[y + dy, x + dx, c])
+                        total += value
+                        total_sq += value * value
+                        # The template is zero-mean, so the window mean drops out here.
+                        cross += value * template[dy, dx, c]
+                window_sq += total_sq - total * total / count
+            if window_sq > 0.0:
+                scores[y, x] = cross / np.sqrt(template_sq * window_sq)
+    return scores
+
+
+@functools.lru_cache(maxsize=None)
+def _match_kernel():
+    """Compile _ccoeff_normed with Numba on first use; None if Numba isn't installed.
+
+    This is the fallback matcher when OpenCV is missing. cache=True keeps the
+    compiled kernel on disk so only the very first run pays the JIT cost.
+    """
+    global numba
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba.njit(parallel=True, cache=True)(_ccoeff_normed)
+
+
+def _clip_region(region: Optional[List[int]]) -> Optional[List[int]]:
+    """Clip a [left, top, width, height] region to the screen.
+
+    Returns the whole screen for no region, and None if the region lies
+    entirely off screen.
+    """
+    screen_width, screen_height = pyautogui.size()
+    if not region:
+        return [0, 0, screen_width, screen_height]
+    left, top = max(region[0], 0), max(region[1], 0)
+    right = min(region[0] + region[2], screen_width)
+    bottom = min(region[1] + region[3], screen_height)
+    if right <= left or bottom <= top:
+        return None
+    return [left, top, right - left, bottom - top]
+
+
+def _locate(image_path: str, region: Optional[List[int]], confidence: float) -> Optional[Tuple[int, int, int, int]]:
+    """Find an image on screen.
+
+    Returns:
+        (left, top, width, height) of the best match in screen coordinates,
+        or None if nothing reaches the requested confidence.
+    """
+    # Only the region is captured and matched, so the matcher's work scales
+    # with the region's area rather than the whole screen's.
+    region = _clip_region(region)
+    if region is None:
+        return None
+    left, top = region[0], region[1]
+    cv2 = _opencv() if np is not None else None
+    match_kernel = _match_kernel() if np is not None and cv2 is None else None
+    if cv2 is None and match_kernel is None:
+        pos = pyautogui.locate(image_path, _grab(region), confidence=confidence)
+        return (left + pos.left, top + pos.top, pos.width, pos.height) if pos else None
+
+    stat = os.stat(image_path)
+    needle = _load_template(image_path, stat.st_mtime_ns, stat.st_size)
+    height, width = needle.shape[:2]
+    if height > region[3] or width > region[2]:
+        return None
+    haystack = _grab_array(region)
+    if cv2 is not None:
+        result = cv2.matchTemplate(haystack, needle, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (x, y) = cv2.minMaxLoc(result)
+    else:
+        result = match_kernel(haystack, needle)
+        y, x = np.unravel_index(np.argmax(result), result.shape)
+        score = result[y, x]
+    if score < confidence:
+        return None
+    return left + int(x), top + int(y), width, height
+
 
 # ====================
 # MOUSE CONTROL TOOLS
 # ====================
 
-@server.tool()
+@lazy_tool(paced=True)
+@tool_safe
 def move_mouse(x: int, y: int, duration: float = 0.0) -> Dict[str, Any]:
     """Move mouse cursor to specified coordinates.
 
@@ -62,14 +465,12 @@ def move_mouse(x: int, y: int, duration: float = 0.0) -> Dict[str, Any]:
     Returns:
         Dictionary with x, y coordinates
     """
-    try:
-        pyautogui.moveTo(x, y, duration=duration)
-        return {"x": x, "y": y, "message": f"Mouse moved to ({x}, {y})"}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    pyautogui.moveTo(x, y, duration=duration)
+    return {"x": x, "y": y, "message": f"Mouse moved to ({x}, {y})"}
 
 
-@server.tool()
+@lazy_tool(paced=True)
+@tool_safe
 def move_mouse_relative(dx: int, dy: int, duration: float = 0.0) -> Dict[str, Any]:
     """Move mouse cursor by a relative amount.
 
@@ -81,14 +482,12 @@ def move_mouse_relative(dx: int, dy: int, duration: float = 0.0) -> Dict[str, An
     Returns:
         Dictionary with dx, dy values
     """
-    try:
-        pyautogui.moveRel(dx, dy, duration=duration)
-        return {"dx": dx, "dy": dy, "message": f"Mouse moved relative by ({dx}, {dy})"}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    pyautogui.moveRel(dx, dy, duration=duration)
+    return {"dx": dx, "dy": dy, "message": f"Mouse moved relative by ({dx}, {dy})"}
 
 
-@server.tool()
+@lazy_tool(paced=True)
+@tool_safe
 def click(
     x: Optional[int] = None,
     y: Optional[int] = None,
@@ -108,21 +507,19 @@ def click(
     Returns:
         Dictionary with click details
     """
-    try:
-        pyautogui.click(x=x, y=y, clicks=clicks, interval=interval, button=button)
-        click_location = f"at ({x}, {y})" if x is not None and y is not None else "at current mouse position"
-        return {
-            "x": x,
-            "y": y,
-            "clicks": clicks,
-            "button": button,
-            "message": f"Clicked {button} button {clicks} time(s) {click_location}"
-        }
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
-
-
-@server.tool()
+    pyautogui.click(x=x, y=y, clicks=clicks, interval=interval, button=button)
+    click_location = f"at ({x}, {y})" if x is not None and y is not None else "at current mouse position"
+    return {
+        "x": x,
+        "y": y,
+        "clicks": clicks,
+        "button": button,
+        "message": f"Clicked {button} button {clicks} time(s) {click_location}"
+    }
+
+
+@lazy_tool(paced=True)
+@tool_safe
 def double_click(x: Optional[int] = None, y: Optional[int] = None, button: str = "left") -> Dict[str, Any]:
     """Double-click at current position or specified coordinates.
 
@@ -134,14 +531,12 @@ def double_click(x: Optional[int] = None, y: Optional[int] = None, button: str =
     Returns:
         Dictionary with click details
     """
-    try:
-        pyautogui.doubleClick(x=x, y=y, button=button)
-        return {"x": x, "y": y, "button": button, "message": f"Double-clicked {button} button"}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    pyautogui.doubleClick(x=x, y=y, button=button)
+    return {"x": x, "y": y, "button": button, "message": f"Double-clicked {button} button"}
 
 
-@server.tool()
+@lazy_tool(paced=True)
+@tool_safe
 def right_click(x: Optional[int] = None, y: Optional[int] = None) -> Dict[str, Any]:
     """Right-click at current position or specified coordinates.
 
@@ -152,14 +547,12 @@ def right_click(x: Optional[int] = None, y: Optional[int] = None) -> Dict[str, A
     Returns:
         Dictionary with click details
     """
-    try:
-        pyautogui.rightClick(x=x, y=y)
-        return {"x": x, "y": y, "message": "Right-clicked"}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    pyautogui.rightClick(x=x, y=y)
+    return {"x": x, "y": y, "message": "Right-clicked"}
 
 
-@server.tool()
+@lazy_tool(paced=True)
+@tool_safe
 def drag_to(x: int, y: int, duration: float = 0.0, button: str = "left") -> Dict[str, Any]:
     """Drag mouse from current position to specified coordinates.
 
@@ -172,14 +565,12 @@ def drag_to(x: int, y: int, duration: float = 0.0, button: str = "left") -> Dict
     Returns:
         Dictionary with destination coordinates
     """
-    try:
-        pyautogui.dragTo(x, y, duration=duration, button=button)
-        return {"x": x, "y": y, "duration": duration, "message": f"Dragged to ({x}, {y})"}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    pyautogui.dragTo(x, y, duration=duration, button=button)
+    return {"x": x, "y": y, "duration": duration, "message": f"Dragged to ({x}, {y})"}
 
 
-@server.tool()
+@lazy_tool(paced=True)
+@tool_safe
 def drag_relative(dx: int, dy: int, duration: float = 0.0, button: str = "left") -> Dict[str, Any]:
     """Drag mouse by a relative amount from current position.
 
@@ -192,14 +583,12 @@ def drag_relative(dx: int, dy: int, duration: float = 0.0, button: str = "left")
     Returns:
         Dictionary with relative movement
     """
-    try:
-        pyautogui.dragRel(dx, dy, duration=duration, button=button)
-        return {"dx": dx, "dy": dy, "message": f"Dragged relative by ({dx}, {dy})"}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    pyautogui.dragRel(dx, dy, duration=duration, button=button)
+    return {"dx": dx, "dy": dy, "message": f"Dragged relative by ({dx}, {dy})"}
 
 
-@server.tool()
+@lazy_tool(paced=True)
+@tool_safe
 def scroll(clicks: int, x: Optional[int] = None, y: Optional[int] = None) -> Dict[str, Any]:
     """Scroll mouse wheel.
 
@@ -211,35 +600,51 @@ def scroll(clicks: int, x: Optional[int] = None, y: Optional[int] = None) -> Dic
     Returns:
         Dictionary with scroll details
     """
-    try:
-        pyautogui.scroll(clicks, x=x, y=y)
-        return {"clicks": clicks, "x": x, "y": y, "message": f"Scrolled {clicks} clicks"}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    pyautogui.scroll(clicks, x=x, y=y)
+    return {"clicks": clicks, "x": x, "y": y, "message": f"Scrolled {clicks} clicks"}
 
 
-@server.tool()
+@lazy_tool()
+@tool_safe
 def get_mouse_position() -> Dict[str, int]:
     """Get current mouse cursor position.
 
     Returns:
         Dictionary with x, y coordinates
     """
-    try:
-        x, y = pyautogui.position()
-        return {"x": x, "y": y}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    x, y = pyautogui.position()
+    return {"x": x, "y": y}
 
 
 # ====================
 # KEYBOARD TOOLS
 # ====================
 
-@server.tool()
+def _paste_text(text: str) -> bool:
+    """Paste text via the clipboard, restoring the old contents; False if no clipboard is available."""
+    if pyperclip is None:
+        return False
+    try:
+        previous = pyperclip.paste()
+        pyperclip.copy(text)
+    except pyperclip.PyperclipException:
+        return False
+    try:
+        pyautogui.hotkey("command" if sys.platform == "darwin" else "ctrl", "v")
+        time.sleep(PASTE_SETTLE)
+    finally:
+        pyperclip.copy(previous)
+    return True
+
+
+@lazy_tool(paced=True)
+@tool_safe
 def type_text(text: str, interval: float = 0.0) -> Dict[str, str]:
     """Type text using keyboard.
 
+    Long printable-ASCII text typed without an interval is pasted through the
+    clipboard instead; the previous clipboard contents are restored afterwards.
+
     Args:
         text: Text to type
         interval: Time between keystrokes (seconds)
@@ -247,14 +652,14 @@ def type_text(text: str, interval: float = 0.0) -> Dict[str, str]:
     Returns:
         Dictionary with status
     """
-    try:
+    paste = len(text) > PASTE_THRESHOLD and interval == 0 and text.isascii() and text.isprintable()
+    if not (paste and _paste_text(text)):
         pyautogui.write(text, interval=interval)
-        return {"text": text, "message": f"Typed text: {text[:50]}..."}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    return {"text": text, "message": f"Typed text: {text[:50]}..."}
 
 
-@server.tool()
+@lazy_tool(paced=True)
+@tool_safe
 def press_key(key: str) -> Dict[str, str]:
     """Press and release a key.
 
@@ -264,14 +669,12 @@ def press_key(key: str) -> Dict[str, str]:
     Returns:
         Dictionary with key pressed
     """
-    try:
-        pyautogui.press(key)
-        return {"key": key, "message": f"Pressed key: {key}"}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    pyautogui.press(key)
+    return {"key": key, "message": f"Pressed key: {key}"}
 
 
-@server.tool()
+@lazy_tool(paced=True)
+@tool_safe
 def key_down(key: str) -> Dict[str, str]:
     """Hold down a key.
 
@@ -281,14 +684,12 @@ def key_down(key: str) -> Dict[str, str]:
     Returns:
         Dictionary with key
     """
-    try:
-        pyautogui.keyDown(key)
-        return {"key": key, "message": f"Key held down: {key}"}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    pyautogui.keyDown(key)
+    return {"key": key, "message": f"Key held down: {key}"}
 
 
-@server.tool()
+@lazy_tool(paced=True)
+@tool_safe
 def key_up(key: str) -> Dict[str, str]:
     """Release a key.
 
@@ -298,14 +699,12 @@ def key_up(key: str) -> Dict[str, str]:
     Returns:
         Dictionary with key
     """
-    try:
-        pyautogui.keyUp(key)
-        return {"key": key, "message": f"Key released: {key}"}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    pyautogui.keyUp(key)
+    return {"key": key, "message": f"Key released: {key}"}
 
 
-@server.tool()
+@lazy_tool(paced=True)
+@tool_safe
 def hotkey(*keys: str) -> Dict[str, Any]:
     """Press key combination (e.g., Ctrl+C).
 
@@ -315,49 +714,143 @@ def hotkey(*keys: str) -> Dict[str, Any]:
     Returns:
         Dictionary with keys pressed
     """
+    pyautogui.hotkey(*keys)
+    return {"keys": list(keys), "message": f"Pressed hotkey: {'+'.join(keys)}"}
+
+
+# ====================
+# BATCH TOOLS
+# ====================
+
+# Operations accepted by batch_actions, mapped to the tools above.
+_BATCH_OPS = {
+    "move": move_mouse,
+    "move_relative": move_mouse_relative,
+    "click": click,
+    "double_click": double_click,
+    "right_click": right_click,
+    "drag": drag_to,
+    "drag_relative": drag_relative,
+    "scroll": scroll,
+    "type": type_text,
+    "press": press_key,
+    "key_down": key_down,
+    "key_up": key_up,
+    "hotkey": hotkey,
+}
+
+
+@lazy_tool(paced=True)
+def batch_actions(actions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Run a sequence of mouse and keyboard actions in a single call.
+
+    Args:
+        actions: Actions to run in order, each {"op": ..., "args": ..., "pause": ...}.
+            op: One of 'move', 'move_relative', 'click', 'double_click',
+                'right_click', 'drag', 'drag_relative', 'scroll', 'type',
+                'press', 'key_down', 'key_up', 'hotkey'
+            args: Keyword arguments of the matching tool (a list of keys for 'hotkey')
+            pause: Seconds to pause after the action (default 0)
+            Execution stops at the first action that fails.
+
+    Returns:
+        Dictionary with the result of each action that ran
+    """
+    results = []
+    previous_pause = pyautogui.PAUSE
     try:
-        pyautogui.hotkey(*keys)
-        return {"keys": list(keys), "message": f"Pressed hotkey: {'+'.join(keys)}"}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+        for action in actions:
+            op = None
+            try:
+                op = action.get("op")
+                func = _BATCH_OPS.get(op)
+                if func is None:
+                    result = {"error": f"Unknown op '{op}'"}
+                else:
+                    pyautogui.PAUSE = action.get("pause", 0.0)
+                    args = action.get("args", {})
+                    result = func(*args) if isinstance(args, list) else func(**args)
+            except Exception as e:
+                # Keep the results of the actions that already ran.
+                result = {"error": str(e)}
+            results.append({"op": op, **result})
+            if "error" in result:
+                break
+    finally:
+        pyautogui.PAUSE = previous_pause
+    return {"results": results, "count": len(results), "message": f"Ran {len(results)} of {len(actions)} actions"}
 
 
 # ====================
 # SCREEN CAPTURE TOOLS
 # ====================
 
-@server.tool()
-def screenshot(filename: Optional[str] = None, region: Optional[List[int]] = None) -> Dict[str, Any]:
+@lazy_tool()
+@tool_safe
+def screenshot(
+    filename: Optional[str] = None,
+    region: Optional[List[int]] = None,
+    encoding: str = "png"
+) -> Union[MCPImage, TextContent, Dict[str, Any]]:
     """Take a screenshot of the entire screen or a region.
 
     Args:
         filename: Optional filename to save screenshot (e.g., 'screenshot.png')
         region: Optional [left, top, width, height] to screenshot specific area
+        encoding: Format of the returned image when no filename is given
+            ('png', 'jpeg', 'ppm' or 'raw', default 'png'). 'ppm' and 'raw'
+            skip compression entirely; 'raw' returns the bare pixel buffer.
 
     Returns:
-        Dictionary with screenshot info. If no filename is provided, the image
-        is returned as a base64 encoded string.
+        If no filename is provided, the image itself as MCP image content
+        (or, for 'raw', JSON with the base64 encoded pixel buffer and its
+        width, height and mode).
+        Otherwise a dictionary with screenshot info.
     """
-    try:
-        img = pyautogui.screenshot(region=region)
-        if filename is None:
-            buffered = io.BytesIO()
-            img.save(buffered, format="PNG")
-            img_str = base64.b64encode(buffered.getvalue()).decode("utf-8")
-            return {"message": "Screenshot taken", "region": region, "image_base64": img_str}
+    if encoding not in SCREENSHOT_ENCODINGS:
+        return {"error": f"Invalid encoding '{encoding}'. Use one of: {', '.join(SCREENSHOT_ENCODINGS)}."}
+    img = _grab(region)
+    if filename is None:
+        if encoding == "raw":
+            return _json_content({
+                "message": "Screenshot taken",
+                "region": region,
+                "encoding": encoding,
+                "width": img.width,
+                "height": img.height,
+                "mode": img.mode,
+                "image_base64": base64.b64encode(img.tobytes()).decode("utf-8"),
+            })
+        if encoding == "ppm":
+            # A binary PPM is just a tiny header in front of the RGB buffer.
+            data = b"P6\n%d %d\n255\n" % img.size + img.tobytes()
         else:
-            # Security: Sanitize filename and save to a dedicated directory
-            screenshots_dir = "screenshots"
-            os.makedirs(screenshots_dir, exist_ok=True)
-            safe_filename = os.path.basename(filename)
-            save_path = os.path.join(screenshots_dir, safe_filename)
-            img.save(save_path)
-            return {"filename": save_path, "region": region, "message": f"Screenshot saved to {save_path}"}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+            buffered = _get_bio()
+            if encoding == "jpeg":
+                img.save(buffered, format="JPEG", quality=85)
+            else:
+                img.save(buffered, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+            data = _bio_value(buffered)
+        # Hand the encoded bytes to MCP as image content; it base64-encodes
+        # them once at the transport edge with the right MIME type.
+        return MCPImage(data=data, format=_IMAGE_FORMATS[encoding])
+    else:
+        # Security: Sanitize filename and save to a dedicated directory
+        screenshots_dir = "screenshots"
+        os.makedirs(screenshots_dir, exist_ok=True)
+        safe_filename = os.path.basename(filename)
+        save_path = os.path.join(screenshots_dir, safe_filename)
+        if pyspng is not None and save_path.lower().endswith(".png"):
+            # pyspng calls libpng directly, skipping PIL's slower PNG encoder.
+            with open(save_path, "wb") as f:
+                f.write(pyspng.encode(np.asarray(img), compress_level=PNG_COMPRESS_LEVEL))
+        else:
+            # The format follows the file extension; compress_level only affects PNG.
+            img.save(save_path, compress_level=PNG_COMPRESS_LEVEL)
+        return {"filename": save_path, "region": region, "message": f"Screenshot saved to {save_path}"}
 
 
-@server.tool()
+@lazy_tool()
 def locate_on_screen(image_path: str, region: Optional[List[int]] = None, confidence: float = 0.9) -> Dict[str, Any]:
     """Find an image on the screen.
 
@@ -370,20 +863,17 @@ def locate_on_screen(image_path: str, region: Optional[List[int]] = None, confid
         Dictionary with location (left, top, width, height) or error message
     """
     try:
-
-        if region:
-            pos = pyautogui.locateOnScreen(image_path, region=region, confidence=confidence)
-        else:
-            pos = pyautogui.locateOnScreen(image_path, confidence=confidence)
+        pos = _locate(image_path, region, confidence)
 
         if pos:
+            left, top, width, height = pos
             return {
                 "found": True,
-                "left": pos.left,
-                "top": pos.top,
-                "width": pos.width,
-                "height": pos.height,
-                "message": f"Found image at ({pos.left}, {pos.top})"
+                "left": left,
+                "top": top,
+                "width": width,
+                "height": height,
+                "message": f"Found image at ({left}, {top})"
             }
         else:
             return {"found": False, "message": "Image not found on screen"}
@@ -391,7 +881,7 @@ def locate_on_screen(image_path: str, region: Optional[List[int]] = None, confid
         return {"found": False, "error": str(e), "message": f"Error finding image: {e}"}
 
 
-@server.tool()
+@lazy_tool()
 def locate_center_on_screen(image_path: str, region: Optional[List[int]] = None, confidence: float = 0.9) -> Dict[str, Any]:
     """Find center point of an image on the screen.
 
@@ -404,18 +894,17 @@ def locate_center_on_screen(image_path: str, region: Optional[List[int]] = None,
         Dictionary with x, y coordinates or error message
     """
     try:
-
-        if region:
-            pos = pyautogui.locateCenterOnScreen(image_path, region=region, confidence=confidence)
-        else:
-            pos = pyautogui.locateCenterOnScreen(image_path, confidence=confidence)
+        pos = _locate(image_path, region, confidence)
 
         if pos:
+            left, top, width, height = pos
+            x = left + width // 2
+            y = top + height // 2
             return {
                 "found": True,
-                "x": pos.x,
-                "y": pos.y,
-                "message": f"Found image center at ({pos.x}, {pos.y})"
+                "x": x,
+                "y": y,
+                "message": f"Found image center at ({x}, {y})"
             }
         else:
             return {"found": False, "message": "Image not found on screen"}
@@ -423,7 +912,8 @@ def locate_center_on_screen(image_path: str, region: Optional[List[int]] = None,
         return {"found": False, "error": str(e), "message": f"Error finding image: {e}"}
 
 
-@server.tool()
+@lazy_tool()
+@tool_safe
 def get_pixel_color(x: int, y: int) -> Dict[str, str]:
     """Get RGB color of pixel at coordinates.
 
@@ -434,14 +924,11 @@ def get_pixel_color(x: int, y: int) -> Dict[str, str]:
     Returns:
         Dictionary with r, g, b values
     """
-    try:
-        r, g, b = pyautogui.pixel(x, y)
-        return {"x": x, "y": y, "r": r, "g": g, "b": b, "hex": f"#{r:02x}{g:02x}{b:02x}"}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    r, g, b = _grab_pixel(x, y)
+    return {"x": x, "y": y, "r": r, "g": g, "b": b, "hex": "#" + _HEX[r] + _HEX[g] + _HEX[b]}
 
 
-@server.tool()
+@lazy_tool()
 def pixel_matches_color(x: int, y: int, color: str, tolerance: int = 0) -> Dict[str, Any]:
     """Check if pixel at coordinates matches expected color.
 
@@ -455,23 +942,13 @@ def pixel_matches_color(x: int, y: int, color: str, tolerance: int = 0) -> Dict[
         Dictionary with match result
     """
     try:
-        rgb_tuple = None
-        if color.startswith('#'):
-            hex_color = color.lstrip('#')
-            if len(hex_color) == 6:
-                rgb_tuple = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-            else:
-                raise ValueError("Hex color must be in #RRGGBB format.")
-        elif color.startswith('('):
-            color_values = color.strip('() ').split(',')
-            if len(color_values) == 3:
-                rgb_tuple = tuple(int(c.strip()) for c in color_values)
-            else:
-                raise ValueError("RGB color must be a tuple/list of 3 integers.")
-        else:
-            raise ValueError("Invalid color format. Use '#RRGGBB' or '(R, G, B)'.")
-
-        matches = pyautogui.pixelMatchesColor(x, y, rgb_tuple, tolerance=tolerance)
+        expected_r, expected_g, expected_b = _parse_color(color)
+        r, g, b = _grab_pixel(x, y)
+        matches = (
+            abs(r - expected_r) <= tolerance
+            and abs(g - expected_g) <= tolerance
+            and abs(b - expected_b) <= tolerance
+        )
         return {"x": x, "y": y, "color": color, "matches": matches}
     except Exception as e:
         return {"error": f"Failed to process color '{color}': {e}"}
@@ -481,21 +958,19 @@ def pixel_matches_color(x: int, y: int, color: str, tolerance: int = 0) -> Dict[
 # WINDOW MANAGEMENT
 # ====================
 
-@server.tool()
+@lazy_tool()
+@tool_safe
 def get_screen_size() -> Dict[str, int]:
     """Get screen width and height in pixels.
 
     Returns:
         Dictionary with width, height
     """
-    try:
-        width, height = pyautogui.size()
-        return {"width": width, "height": height}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    width, height = pyautogui.size()
+    return {"width": width, "height": height}
 
 
-@server.tool()
+@lazy_tool()
 def get_active_window_title() -> Dict[str, Any]:
     """Get title of currently active window.
 
@@ -509,7 +984,7 @@ def get_active_window_title() -> Dict[str, Any]:
         return {"title": None, "error": str(e)}
 
 
-@server.tool()
+@lazy_tool()
 def get_all_window_titles() -> Dict[str, List[str]]:
     """Get list of all visible window titles.
 
@@ -523,32 +998,62 @@ def get_all_window_titles() -> Dict[str, List[str]]:
         return {"titles": [], "count": 0, "error": str(e)}
 
 
-@server.tool()
-def get_windows_with_title(title_fragment: str) -> Dict[str, List[Dict[str, str]]]:
+@lazy_tool()
+def get_windows_with_title(title_fragment: str) -> Dict[str, Any]:
     """Find windows with titles containing specified text.
 
     Args:
         title_fragment: Text to search for in window titles
 
     Returns:
-        Dictionary with matching windows
+        Dictionary of parallel lists (titles, left, top, width, height), one
+        entry per matching window, plus the count
     """
     try:
         windows = pyautogui.getWindowsWithTitle(title_fragment)
-        result = [
-            {"title": win.title, "left": win.left, "top": win.top, "width": win.width, "height": win.height}
-            for win in windows
-        ]
-        return {"windows": result, "count": len(result)}
+        titles, lefts, tops, widths, heights = [], [], [], [], []
+        for win in windows:
+            titles.append(win.title)
+            lefts.append(win.left)
+            tops.append(win.top)
+            widths.append(win.width)
+            heights.append(win.height)
+        return {"titles": titles, "left": lefts, "top": tops, "width": widths, "height": heights, "count": len(titles)}
     except pyautogui.PyAutoGUIException as e:
-        return {"windows": [], "count": 0, "error": str(e)}
+        return {"titles": [], "left": [], "top": [], "width": [], "height": [], "count": 0, "error": str(e)}
+
+
+@lazy_tool()
+def get_window_records_with_title(title_fragment: str) -> Dict[str, Any]:
+    """Find windows with titles containing specified text, one record per window.
+
+    Same data as get_windows_with_title, as a list of per-window dictionaries.
+
+    Args:
+        title_fragment: Text to search for in window titles
+
+    Returns:
+        Dictionary with matching windows
+    """
+    columns = get_windows_with_title(title_fragment)
+    windows = [
+        {"title": title, "left": left, "top": top, "width": width, "height": height}
+        for title, left, top, width, height in zip(
+            columns["titles"], columns["left"], columns["top"], columns["width"], columns["height"]
+        )
+    ]
+    result = {"windows": windows, "count": len(windows)}
+    if "error" in columns:
+        result["error"] = columns["error"]
+    return result
 
 
 # ====================
 # USER INTERACTION TOOLS
 # ====================
 
-@server.tool()
+@lazy_tool()
+@tool_safe
 def alert(message: str, title: str = "Alert") -> Dict[str, str]:
     """Show an alert dialog.
 
@@ -559,14 +1064,12 @@ def alert(message: str, title: str = "Alert") -> Dict[str, str]:
     Returns:
         Dictionary with message
     """
-    try:
-        result = pyautogui.alert(message, title)
-        return {"message": message, "title": title, "result": result}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    result = pyautogui.alert(message, title)
+    return {"message": message, "title": title, "result": result}
 
 
-@server.tool()
+@lazy_tool()
+@tool_safe
 def confirm(message: str, title: str = "Confirm", options: Optional[List[str]] = None) -> Dict[str, str]:
     """Show a confirmation dialog with OK/Cancel or custom options.
 
@@ -578,17 +1081,15 @@ def confirm(message: str, title: str = "Confirm", options: Optional[List[str]] =
     Returns:
         Dictionary with result
     """
-    try:
-        if options:
-            result = pyautogui.confirm(message, title, options)
-        else:
-            result = pyautogui.confirm(message, title)
-        return {"message": message, "title": title, "options": options or ['OK', 'Cancel'], "result": result}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    if options:
+        result = pyautogui.confirm(message, title, options)
+    else:
+        result = pyautogui.confirm(message, title)
+    return {"message": message, "title": title, "options": options or ['OK', 'Cancel'], "result": result}
 
 
-@server.tool()
+@lazy_tool()
+@tool_safe
 def prompt(message: str, title: str = "Prompt", default: str = "") -> Dict[str, str]:
     """Show a prompt dialog for user input.
 
@@ -600,14 +1101,12 @@ def prompt(message: str, title: str = "Prompt", default: str = "") -> Dict[str,
     Returns:
         Dictionary with result
     """
-    try:
-        result = pyautogui.prompt(message, title, default)
-        return {"message": message, "title": title, "default": default, "result": result}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    result = pyautogui.prompt(message, title, default)
+    return {"message": message, "title": title, "default": default, "result": result}
 
 
-@server.tool()
+@lazy_tool()
+@tool_safe
 def password(message: str, title: str = "Password", mask: str = "*") -> Dict[str, str]:
     """Show a password input dialog.
 
@@ -619,55 +1118,140 @@ def password(message: str, title: str = "Password", mask: str = "*") -> Dict[str
     Returns:
         Dictionary with result (password hidden in logs)
     """
-    try:
-        result = pyautogui.password(message, title, mask)
-        # Never return the actual password, even in case of success.
-        return {"message": message, "title": title, "mask": mask, "result": "[REDACTED]" if result else None}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    result = pyautogui.password(message, title, mask)
+    # Never return the actual password, even in case of success.
+    return {"message": message, "title": title, "mask": mask, "result": "[REDACTED]" if result else None}
 
 
 # ====================
 # UTILITY TOOLS
 # ====================
 
-@server.tool()
-def countdown(seconds: int) -> Dict[str, int]:
-    """Show a countdown timer on screen.
+def _submit_job(func, *args) -> int:
+    """Run func(*args, stop) on the background executor and return its job id.
+
+    stop is a threading.Event the job must poll; it is set by cancel_job and
+    on server shutdown.
+    """
+    finished = [job_id for job_id, (future, _) in _JOBS.items() if future.done()]
+    for job_id in finished[:-MAX_FINISHED_JOBS]:
+        del _JOBS[job_id]
+    stop = threading.Event()
+    job_id = next(_JOB_IDS)
+    _JOBS[job_id] = (_EXEC.submit(func, *args, stop), stop)
+    return job_id
+
+
+def _cancel_jobs() -> None:
+    """Ask every background job to stop."""
+    for _, stop in _JOBS.values():
+        stop.set()
+
+
+def _countdown(seconds: int, stop: threading.Event) -> None:
+    # Stdout carries the MCP stdio transport, so progress goes to stderr.
+    for remaining in range(seconds, 0, -1):
+        print(remaining, end=" ", file=sys.stderr, flush=True)
+        if stop.wait(1):
+            break
+    print(file=sys.stderr)
+
+
+def _display_mouse_position(seconds: int, stop: threading.Event) -> None:
+    # Stdout carries the MCP stdio transport, so the position goes to stderr.
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        x, y = pyautogui.position()
+        print(f"\rX: {x:>5} Y: {y:>5}", end="", file=sys.stderr, flush=True)
+        if stop.wait(0.1):
+            break
+    print(file=sys.stderr)
+
+
+@lazy_tool()
+def countdown(seconds: int) -> Dict[str, Any]:
+    """Show a countdown timer.
+
+    The countdown runs in the background; use wait_for_job to wait for it
+    or cancel_job to stop it.
 
     Args:
         seconds: Number of seconds to count down
 
     Returns:
-        Dictionary with countdown duration
+        Dictionary with the job id and countdown duration
     """
-    try:
-        pyautogui.countdown(seconds)
-        return {"seconds": seconds, "message": f"Countdown completed for {seconds} seconds"}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    job_id = _submit_job(_countdown, seconds)
+    return {"job_id": job_id, "status": "running", "seconds": seconds, "message": f"Countdown started for {seconds} seconds"}
 
 
-@server.tool()
+@lazy_tool()
 def display_mouse_position(seconds: int = 5) -> Dict[str, Any]:
     """Display current mouse position for specified seconds.
 
+    The display loop runs in the background; use wait_for_job to wait for it
+    or cancel_job to stop it.
+
     Args:
         seconds: Number of seconds to display (default 5)
 
     Returns:
-        Dictionary with a confirmation message.
+        Dictionary with the job id and a confirmation message.
     """
-    try:
-        # This function runs a loop, so it\'s better to run it in a separate process
-        # if the server needs to remain responsive. For now, it will block.
-        pyautogui.displayMousePosition(seconds)
-        return {"seconds": seconds, "message": f"Mouse position displayed for {seconds} seconds"}
-    except pyautogui.PyAutoGUIException as e:
-        return {"error": str(e)}
+    job_id = _submit_job(_display_mouse_position, seconds)
+    return {"job_id": job_id, "status": "running", "seconds": seconds, "message": f"Displaying mouse position for {seconds} seconds"}
+
 
+@lazy_tool()
+async def wait_for_job(job_id: int, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Wait for a background job started by countdown or display_mouse_position.
+
+    Other tool calls keep being served while this waits.
+
+    Args:
+        job_id: Job id returned when the job was started
+        timeout: Seconds to wait (default None waits until the job finishes, 0 only checks)
+
+    Returns:
+        Dictionary with job status ('running', 'done' or 'failed')
+    """
+    job = _JOBS.get(job_id)
+    if job is None:
+        return {"job_id": job_id, "error": f"Unknown job id: {job_id}"}
+    future, _ = job
+    if not future.done():
+        try:
+            # shield() keeps a timeout from cancelling the job itself.
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.TimeoutError:
+            return {"job_id": job_id, "status": "running"}
+        except Exception:
+            pass  # Reported from the future below.
+    _JOBS.pop(job_id, None)
+    error = future.exception()
+    if error is not None:
+        return {"job_id": job_id, "status": "failed", "error": str(error)}
+    return {"job_id": job_id, "status": "done"}
+
+
+@lazy_tool()
+def cancel_job(job_id: int) -> Dict[str, Any]:
+    """Stop a background job early.
+
+    Args:
+        job_id: Job id returned when the job was started
 
-@server.tool()
+    Returns:
+        Dictionary with the job id; collect the job with wait_for_job
+    """
+    job = _JOBS.get(job_id)
+    if job is None:
+        return {"job_id": job_id, "error": f"Unknown job id: {job_id}"}
+    job[1].set()
+    return {"job_id": job_id, "message": f"Job {job_id} asked to stop"}
+
+
+@lazy_tool()
 def fail_safe_check() -> Dict[str, bool]:
     """Check if PyAutoGUI failsafe is enabled.
 
@@ -680,25 +1264,26 @@ def fail_safe_check() -> Dict[str, bool]:
 
 # Main entry point
 if __name__ == "__main__":
-    import sys
+    import importlib.util
 
-    # Check if PyAutoGUI is properly installed
-    try:
-        import pyautogui
-        print(f"✓ PyAutoGUI {pyautogui.__version__} loaded successfully", file=sys.stderr)
-    except ImportError as e:
-        print(f"✗ Error importing PyAutoGUI: {e}", file=sys.stderr)
-        sys.exit(1)
+    print(f"✓ PyAutoGUI {pyautogui.__version__} loaded successfully", file=sys.stderr)
 
-    # Check for optional dependencies
-    try:
-        import cv2
+    # Check for optional dependencies without importing them; they are
+    # loaded on the first image search.
+    if importlib.util.find_spec("cv2") is not None:
         print("✓ OpenCV (cv2) found. Image recognition with 'confidence' will be available.", file=sys.stderr)
-    except ImportError:
+    elif importlib.util.find_spec("numba") is not None:
+        print("⚠️  Warning: OpenCV (cv2) not found. Image recognition with 'confidence' will use the slower Numba matcher.", file=sys.stderr)
+        print("   To install it, run: pip install opencv-python", file=sys.stderr)
+    else:
         print("⚠️  Warning: OpenCV (cv2) not found. The 'confidence' parameter for image location will not work.", file=sys.stderr)
         print("   To install it, run: pip install opencv-python", file=sys.stderr)
 
 
     # Run the server
     print("Starting PyAutoGUI MCP Server...", file=sys.stderr)
-    server.run()
+    try:
+        server.run()
+    finally:
+        # The executor joins its threads at exit, so stop any running jobs first.
+        _cancel_jobs()